@@ -125,9 +125,10 @@ def play_video(
         audio_player = AudioPlayer(image_path, logger)
         audio_started = audio_player.start()
         if audio_started:
-            logger.log("Audio playback enabled")
+            # A video without an audio track is reported by the audio thread itself
+            logger.log("Audio playback enabled (decoder started)")
         else:
-            logger.log("Audio playback not available or video has no audio")
+            logger.log("Audio playback not available (miniaudio or ffmpeg missing)")
             audio_player = None
 
     hide_cursor, show_cursor = "\033[?25l", "\033[?25h"
@@ -2,14 +2,16 @@
 audio_player.py - Audio Playback Handler
 
 This module provides low-latency audio playback functionality for video files.
-It uses the miniaudio library which supports multiple audio formats (WAV, MP3, FLAC, etc.)
-and provides very low latency playback.
+Audio is decoded by ffmpeg into raw PCM and streamed through a pipe into the
+miniaudio library, which provides very low latency playback. A dedicated reader
+thread keeps a ring buffer filled so the audio callback never waits on ffmpeg.
 """
+import io
 import os
+import sys
 import subprocess
-import tempfile
 from threading import Thread, Event
-from typing import Optional
+from typing import Optional, Generator, Union
 from .debug_logger import DebugLogger
 
 try:
@@ -18,176 +20,599 @@ try:
 except ImportError:
     AUDIO_AVAILABLE = False
 
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None  # type: ignore
+
+# PCM format requested from ffmpeg and played by miniaudio (signed 16-bit).
+# ffmpeg resamples and remixes any source to this, so the track's own rate and
+# channel layout never need probing before playback can start.
+AUDIO_SAMPLE_RATE = 44100
+AUDIO_CHANNELS = 2
+SAMPLE_WIDTH = 2
+
+# Size of the ring buffer fed from the ffmpeg pipe (~1.5 s of audio)
+RING_CAPACITY = 1 << 18
+
+# Linux fcntl command to resize a pipe, and the capacity requested for ffmpeg's
+# stdout pipe
+F_SETPIPE_SZ = getattr(fcntl, 'F_SETPIPE_SZ', 1031)
+PIPE_SIZE = 1 << 20
+
+# Real-time priority requested for the pipe reader thread, and the nice value
+# tried instead when real-time scheduling is not permitted
+READER_RT_PRIORITY = 10
+READER_NICE_INCREMENT = -5
+
+# Start decoding without ffmpeg's multi-second probe of the input. These must
+# come before -i; containers that need a longer probe are retried without them.
+FFMPEG_LOW_LATENCY_ARGS = ['-probesize', '32', '-analyzeduration', '0',
+                           '-fflags', 'nobuffer', '-flags', 'low_delay']
+
+
+class _RingBuffer:
+    """
+    A fixed-size single-producer/single-consumer byte ring buffer.
+
+    The producer only advances the write position and the consumer only advances
+    the read position, so neither side takes a lock. The consumer never blocks;
+    the producer waits for free space when the buffer is full.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Initialize the ring buffer.
+
+        Args:
+            capacity (int): Size of the buffer in bytes.
+        """
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self._capacity = capacity
+        self._read_pos = 0  # Total bytes consumed
+        self._write_pos = 0  # Total bytes produced
+        self._space_event = Event()
+        self._data_event = Event()
+        self.eof = False
+
+    def available(self) -> int:
+        """Returns the number of bytes ready to be read."""
+        return self._write_pos - self._read_pos
+
+    def produced(self) -> int:
+        """Returns the total number of bytes written so far."""
+        return self._write_pos
+
+    def reserve(self, stop_event: Event) -> memoryview:
+        """
+        Returns a writable view of the free space at the write position.
+
+        The producer fills the view in place (e.g. with `readinto`) and then
+        calls `commit`. Waits while the buffer is full.
+
+        Args:
+            stop_event (Event): Aborts the wait for free space when set.
+
+        Returns:
+            memoryview: Contiguous free space; empty if stopped first.
+        """
+        while True:
+            free = self._capacity - self.available()
+            if free:
+                break
+            self._space_event.clear()
+            # Re-check after clearing so a read in between is not missed
+            if self._capacity - self.available() == 0:
+                self._space_event.wait(0.05)
+            if stop_event.is_set():
+                return self._view[:0]
+
+        start = self._write_pos % self._capacity
+        return self._view[start:start + min(free, self._capacity - start)]
+
+    def commit(self, n: int) -> None:
+        """
+        Publishes `n` bytes written into the view returned by `reserve`.
+
+        Args:
+            n (int): The number of bytes written.
+        """
+        self._write_pos += n
+        if self._write_pos == n:
+            self._data_event.set()  # First data; see wait_for_first_data
+
+    def read_into(self, out: memoryview) -> int:
+        """
+        Copies up to `len(out)` bytes from the buffer into `out` without blocking.
+
+        Args:
+            out (memoryview): The writable destination.
+
+        Returns:
+            int: The number of bytes copied; less than `len(out)` if the buffer ran low.
+        """
+        n = min(len(out), self.available())
+        start = self._read_pos % self._capacity
+        first = min(n, self._capacity - start)
+        out[:first] = self._view[start:start + first]
+        if n > first:
+            out[first:n] = self._view[:n - first]
+        self.consume(n)
+        return n
+
+    def peek(self, n: int) -> memoryview:
+        """
+        Returns a read-only view of up to `n` bytes at the read position.
+
+        The bytes stay in the buffer, and the producer cannot overwrite them,
+        until `consume` is called, so the view can be handed out without copying.
+
+        Args:
+            n (int): The maximum number of bytes to view.
+
+        Returns:
+            memoryview: Contiguous readable data; shorter than `n` if the buffer
+            ran low or the data wraps around the end of the buffer.
+        """
+        start = self._read_pos % self._capacity
+        n = min(n, self.available(), self._capacity - start)
+        return self._view[start:start + n].toreadonly()
+
+    def consume(self, n: int) -> None:
+        """
+        Releases `n` bytes at the read position back to the producer.
+
+        Args:
+            n (int): The number of bytes to release.
+        """
+        self._read_pos += n
+        self._space_event.set()
+
+    def close(self) -> None:
+        """Marks the end of the stream; no more data will be written."""
+        self.eof = True
+        self._data_event.set()
+
+    def wait_for_first_data(self, timeout: float) -> bool:
+        """
+        Waits until the first data has been written or the stream has ended.
+
+        Based on `produced`, not `available`, because the consumer may already
+        have drained the buffer. Both outcomes are final, so the event is never
+        cleared and, once set, callers get their answer without waiting.
+
+        Args:
+            timeout (float): The maximum time to wait in seconds.
+
+        Returns:
+            bool: True if any data was ever written.
+        """
+        self._data_event.wait(timeout)
+        return self.produced() > 0
+
 
 class AudioPlayer:
     """
     A low-latency audio player for video files.
-    
-    Extracts audio from video files and plays it in sync with video playback.
-    Uses a separate thread to avoid blocking the main video rendering loop.
+
+    Streams audio from video files and plays it in sync with video playback.
+    Uses separate threads to avoid blocking the main video rendering loop.
     """
-    
+
+    # Audio backend found by the first device opened in this process, so later
+    # players skip miniaudio's probing of backends that are not running. The CLI
+    # opens one player per run; this pays off when playing several videos from
+    # one process.
+    _backend: Optional['miniaudio.Backend'] = None
+
     def __init__(self, video_path: str, logger: DebugLogger):
         """
         Initialize the audio player.
-        
+
         Args:
             video_path (str): Path to the video file.
             logger (DebugLogger): Logger for debug output.
         """
         self.video_path = video_path
         self.logger = logger
-        self.audio_file: Optional[str] = None
+        self.proc: Optional[subprocess.Popen] = None
+        self.ring: Optional[_RingBuffer] = None
+        self.reader_thread: Optional[Thread] = None
         self.device: Optional[miniaudio.PlaybackDevice] = None
-        self.stream: Optional[miniaudio.StreamableSource] = None
+        self.stream: Optional[Generator[Union[bytes, memoryview], int, None]] = None
         self.thread: Optional[Thread] = None
         self.stop_event = Event()
         self.audio_available = AUDIO_AVAILABLE
-        
+
         if not AUDIO_AVAILABLE:
             self.logger.log("Warning: miniaudio not available. Audio playback disabled.")
-    
-    def _extract_audio(self) -> Optional[str]:
+
+    def _start_ffmpeg(self, low_latency: bool = True) -> bool:
         """
-        Extract audio from video file to a temporary WAV file.
-        
+        Start ffmpeg decoding the video's audio track to raw PCM on its stdout.
+
+        Args:
+            low_latency (bool): Whether to skip ffmpeg's input probing delay.
+
         Returns:
-            Optional[str]: Path to the extracted audio file, or None if extraction failed.
+            bool: True if ffmpeg was started, False otherwise.
         """
-        if not self.audio_available:
-            return None
-        
-        # Create a temporary file for the audio
-        temp_fd, temp_path = tempfile.mkstemp(suffix='.wav', prefix='ansipix_audio_')
-        os.close(temp_fd)
-        
+        input_args = FFMPEG_LOW_LATENCY_ARGS if low_latency else []
         try:
-            # Use OpenCV to extract audio - check if video has audio first
-            import cv2
-            cap = cv2.VideoCapture(self.video_path)
-            # OpenCV doesn't provide direct audio access, so we'll use subprocess with ffmpeg if available
-            cap.release()
-            
-            # Try to use ffmpeg to extract audio
+            self.proc = subprocess.Popen(
+                ['ffmpeg', '-v', 'quiet', '-nostdin', *input_args, '-i', self.video_path, '-vn',
+                 '-f', 's16le', '-acodec', 'pcm_s16le',
+                 '-ar', str(AUDIO_SAMPLE_RATE), '-ac', str(AUDIO_CHANNELS), '-'],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                bufsize=0
+            )
+            self._grow_pipe(self.proc.stdout.fileno())
+            return True
+        except (FileNotFoundError, OSError) as e:
+            self.logger.log(f"Could not start ffmpeg for audio: {e}")
+            return False
+
+    def _grow_pipe(self, fd: int) -> None:
+        """
+        Enlarge the kernel pipe buffer so ffmpeg rarely blocks on a full pipe.
+
+        Linux only; elsewhere, or if the request is refused, the default size is kept.
+
+        Args:
+            fd (int): File descriptor of the pipe's read end.
+        """
+        if fcntl is None or not sys.platform.startswith('linux'):
+            return
+        try:
+            fcntl.fcntl(fd, F_SETPIPE_SZ, PIPE_SIZE)
+        except OSError as e:
+            self.logger.log(f"Could not enlarge audio pipe buffer: {e}")
+
+    def _stop_ffmpeg(self) -> None:
+        """
+        Terminate ffmpeg if it is still running and wait for the reader thread.
+        """
+        proc, self.proc = self.proc, None
+        if not proc:
+            return
+
+        if proc.poll() is None:
+            proc.terminate()
             try:
-                result = subprocess.run(
-                    ['ffmpeg', '-i', self.video_path, '-vn', '-acodec', 'pcm_s16le', 
-                     '-ar', '44100', '-ac', '2', '-y', temp_path],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    timeout=10
-                )
-                
-                if result.returncode == 0 and os.path.exists(temp_path) and os.path.getsize(temp_path) > 0:
-                    self.logger.log(f"Audio extracted successfully to {temp_path}")
-                    return temp_path
-                else:
-                    self.logger.log("Audio extraction failed or video has no audio stream")
-                    os.unlink(temp_path)
-                    return None
-            except (FileNotFoundError, subprocess.TimeoutExpired, Exception) as e:
-                self.logger.log(f"Could not extract audio: {e}")
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
-                return None
-                
+                proc.wait(timeout=1.0)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+        # The reader sees EOF once ffmpeg is gone; let it finish first
+        if self.reader_thread and self.reader_thread.is_alive():
+            self.reader_thread.join(timeout=1.0)
+        proc.stdout.close()
+        self.logger.log("Stopped ffmpeg audio decoder")
+
+    def _raise_thread_priority(self) -> None:
+        """
+        Raise the calling thread's scheduling priority, best effort.
+
+        Tries SCHED_FIFO, then a lower nice value. Both usually need extra
+        privileges, so failure is silent and the thread keeps its priority.
+        On Linux both calls apply to the calling thread only.
+        """
+        if not sys.platform.startswith('linux'):
+            return
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(READER_RT_PRIORITY))
+            self.logger.log("Audio reader thread running with SCHED_FIFO priority")
+            return
+        except (OSError, AttributeError):
+            pass
+        try:
+            os.nice(READER_NICE_INCREMENT)
+        except OSError:
+            pass
+
+    def _reader_loop(self, pipe: io.RawIOBase, ring: _RingBuffer):
+        """
+        The pipe reader loop running in a separate thread.
+        Moves PCM data from the ffmpeg pipe into the ring buffer.
+
+        Args:
+            pipe (io.RawIOBase): ffmpeg's unbuffered stdout pipe.
+            ring (_RingBuffer): The buffer feeding the playback generator.
+        """
+        # Keep up with the audio callback even when video rendering saturates
+        # the CPU; miniaudio already runs its own device thread at high priority
+        self._raise_thread_priority()
+        try:
+            while not self.stop_event.is_set():
+                # Offer all contiguous free space, so a single read(2) drains
+                # as much of the pipe backlog as fits, straight into ring storage
+                region = ring.reserve(self.stop_event)
+                if not region:
+                    break
+                n = pipe.readinto(region)
+                if not n:
+                    break
+                ring.commit(n)
         except Exception as e:
-            self.logger.log(f"Error during audio extraction: {e}")
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
-            return None
-    
+            self.logger.log(f"Error reading audio from ffmpeg: {e}")
+        finally:
+            ring.close()
+
+    def _launch_decoder(self, low_latency: bool) -> bool:
+        """
+        Start ffmpeg and the reader thread that fills a fresh ring buffer.
+
+        Args:
+            low_latency (bool): Whether to skip ffmpeg's input probing delay.
+
+        Returns:
+            bool: True if ffmpeg was started, False otherwise.
+        """
+        if not self._start_ffmpeg(low_latency):
+            return False
+
+        self.ring = _RingBuffer(RING_CAPACITY)
+        self.reader_thread = Thread(target=self._reader_loop, args=(self.proc.stdout, self.ring), daemon=True)
+        self.reader_thread.start()
+        return True
+
+    def _wait_for_audio(self) -> bool:
+        """
+        Wait for the first PCM data from the running decoder.
+
+        If the low-latency run produces nothing, ffmpeg is restarted with its
+        default probing, since some containers need the longer analysis to
+        find the audio stream.
+
+        Returns:
+            bool: True once ffmpeg has produced audio data (the generator may
+            already have played it), False if there is none.
+        """
+        for retry in (False, True):
+            if retry:
+                self._stop_ffmpeg()
+                if self.stop_event.is_set() or not self._launch_decoder(low_latency=False):
+                    return False
+
+            # ffmpeg exits without output if the video has no audio stream
+            while not self.ring.wait_for_first_data(0.1):
+                if self.ring.eof or self.stop_event.is_set():
+                    break
+            else:
+                return True
+        return False
+
+    @staticmethod
+    def _pulse_server_present() -> bool:
+        """
+        Check for a PulseAudio-compatible server (including pipewire-pulse).
+
+        Only looks for the server's socket, at most two stat() calls, instead
+        of letting miniaudio attempt a connection. PipeWire's own
+        `$XDG_RUNTIME_DIR/pipewire-0` socket is deliberately not checked:
+        miniaudio has no PipeWire backend and reaches PipeWire through its
+        PulseAudio socket, or through ALSA's pipewire plugin. A miss only
+        moves PulseAudio after ALSA and JACK in the probe order; nothing is
+        ruled out.
+
+        Returns:
+            bool: True if a server is configured or its socket exists.
+        """
+        if os.environ.get('PULSE_SERVER'):
+            return True
+        runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or f'/run/user/{os.getuid()}'
+        pulse_dir = os.environ.get('PULSE_RUNTIME_PATH') or os.path.join(runtime_dir, 'pulse')
+        return any(os.path.exists(path) for path in (
+            os.path.join(pulse_dir, 'native'),
+            '/var/run/pulse/native',
+        ))
+
+    @staticmethod
+    def _backend_from_name(name: str) -> Optional['miniaudio.Backend']:
+        """
+        Map a device's backend name back to its `miniaudio.Backend` member.
+
+        `PlaybackDevice.backend` is the name miniaudio reports for the backend
+        id, so each member's id is looked up the same way rather than guessing
+        from the display name.
+
+        Args:
+            name (str): The `backend` attribute of an opened device.
+
+        Returns:
+            Optional[miniaudio.Backend]: The matching member, or None.
+        """
+        for backend in miniaudio.Backend:
+            if miniaudio.ffi.string(miniaudio.lib.ma_get_backend_name(backend.value)).decode() == name:
+                return backend
+        return None
+
+    def _create_device(self) -> 'miniaudio.PlaybackDevice':
+        """
+        Open the playback device, reusing the backend found by an earlier player.
+
+        Returns:
+            miniaudio.PlaybackDevice: The opened (not yet started) device.
+        """
+        if AudioPlayer._backend is not None:
+            try:
+                return miniaudio.PlaybackDevice(
+                    sample_rate=AUDIO_SAMPLE_RATE,
+                    nchannels=AUDIO_CHANNELS,
+                    output_format=miniaudio.SampleFormat.SIGNED16,
+                    backends=[AudioPlayer._backend]
+                )
+            except miniaudio.MiniaudioError as e:
+                # e.g. the sound server went away; probe all backends again
+                self.logger.log(f"Cached audio backend unavailable ({e}), probing again")
+                AudioPlayer._backend = None
+
+        # miniaudio tries PulseAudio first on Linux; when no server socket
+        # exists, try ALSA first so the failing connection attempt is skipped
+        backends = None
+        if sys.platform.startswith('linux') and not self._pulse_server_present():
+            backends = [miniaudio.Backend.ALSA, miniaudio.Backend.JACK,
+                        miniaudio.Backend.PULSEAUDIO, miniaudio.Backend.NULL]
+
+        device = miniaudio.PlaybackDevice(
+            sample_rate=AUDIO_SAMPLE_RATE,
+            nchannels=AUDIO_CHANNELS,
+            output_format=miniaudio.SampleFormat.SIGNED16,
+            backends=backends
+        )
+        # The null backend means no real output was found, so keep probing
+        backend = self._backend_from_name(device.backend)
+        if backend is not None and backend is not miniaudio.Backend.NULL:
+            AudioPlayer._backend = backend
+        self.logger.log(f"Audio backend: {device.backend}")
+        return device
+
+    def _audio_stream(self) -> Generator[Union[bytes, memoryview], int, None]:
+        """
+        The playback generator pulled by miniaudio's audio callback.
+
+        Whenever the requested span is contiguous in the ring buffer, a view of
+        it is yielded directly and miniaudio copies straight from ring storage;
+        the span is only released back to the reader thread on the next pull,
+        after that copy is done. Otherwise the data is copied into a scratch
+        buffer, which is likewise yielded as a view and reused on the next
+        pull, and on underrun padded with silence so the callback never
+        waits on the reader thread. This also covers the time before ffmpeg's
+        first output, so the device can be started without waiting for it.
+
+        Yields:
+            Union[bytes, memoryview]: PCM samples for the number of frames sent in by miniaudio.
+        """
+        # Reused across callbacks; only reallocated if miniaudio asks for more
+        scratch = memoryview(bytearray(0))
+        silence = memoryview(b'')
+        # Ring and byte count of a zero-copy view still held by miniaudio
+        lent_ring: Optional[_RingBuffer] = None
+        lent_bytes = 0
+        # Bound once; this loop runs on every audio callback
+        stopped = self.stop_event.is_set
+        bytes_per_frame = AUDIO_CHANNELS * SAMPLE_WIDTH
+
+        required_frames = yield b''
+        while not stopped():
+            if lent_ring:
+                lent_ring.consume(lent_bytes)
+                lent_ring = None
+
+            required_bytes = required_frames * bytes_per_frame
+            # The ring is replaced if ffmpeg is relaunched, so look it up each time
+            ring = self.ring
+            view = ring.peek(required_bytes)
+            if len(view) == required_bytes:
+                lent_ring, lent_bytes = ring, required_bytes
+                required_frames = yield view
+                continue
+
+            if required_bytes > len(scratch):
+                scratch = memoryview(bytearray(required_bytes))
+                silence = memoryview(bytes(required_bytes))
+            out = scratch[:required_bytes]
+            n = ring.read_into(out)
+            if n < required_bytes:
+                if ring.produced():
+                    if ring.eof and ring.available() == 0 and n == 0:
+                        # End of the track: wake the playback thread to clean up
+                        self.stop_event.set()
+                        return
+                    # Underrun (or end of stream): fill the rest with silence.
+                    # Check is_active first so the message is only built when logged.
+                    if self.logger.is_active:
+                        self.logger.log(f"Audio underrun: padded {required_bytes - n} bytes of silence")
+                out[n:] = silence[:required_bytes - n]
+            required_frames = yield out
+
     def _playback_loop(self):
         """
         The audio playback loop running in a separate thread.
         Streams audio data to the playback device.
         """
-        if not self.audio_file or not self.audio_available:
+        if not self.audio_available:
             return
-        
+
         try:
-            # Load the audio file to get properties
-            decoded = miniaudio.wav_read_file_f32(self.audio_file)
-            
-            # Create playback device
-            self.device = miniaudio.PlaybackDevice(
-                sample_rate=decoded.sample_rate,
-                nchannels=decoded.nchannels,
-                output_format=miniaudio.SampleFormat.FLOAT32
-            )
-            
-            self.logger.log(f"Audio playback started: {decoded.sample_rate}Hz, {decoded.nchannels} channels")
-            
+            # Create playback device; ffmpeg, launched by start(), decodes meanwhile
+            self.device = self._create_device()
+
             # Create streaming generator
-            self.stream = miniaudio.stream_file(
-                self.audio_file,
-                output_format=miniaudio.SampleFormat.FLOAT32,
-                nchannels=decoded.nchannels,
-                sample_rate=decoded.sample_rate
-            )
-            
-            # Start playback
+            self.stream = self._audio_stream()
+            next(self.stream)
+
+            # Start playback right away; the generator plays silence until
+            # ffmpeg's first samples arrive instead of gating on them here
+            self.device.stop_callback = self.stop_event.set  # e.g. device unplugged
             self.device.start(self.stream)
-            
-            # Keep thread alive while playing
-            while not self.stop_event.is_set() and self.device:
-                self.stop_event.wait(0.1)
-            
+
+            if not self._wait_for_audio():
+                self.logger.log("No audio to play")
+                return
+
+            self.logger.log(f"Audio playback started: {AUDIO_SAMPLE_RATE}Hz, {AUDIO_CHANNELS} channels")
+
+            # Keep thread alive while playing. The device runs on miniaudio's
+            # own thread; stop(), the end of the track or the device stopping
+            # all set the event, so there is nothing to poll for here.
+            self.stop_event.wait()
+
         except Exception as e:
             self.logger.log(f"Error during audio playback: {e}")
         finally:
             self._cleanup()
-    
+
     def start(self) -> bool:
         """
-        Start audio playback in a separate thread.
-        
+        Start the ffmpeg decoder, then audio playback in a separate thread.
+
+        Only spawning ffmpeg happens here; whether the video actually has an
+        audio track is only known once ffmpeg has read the input. If it has
+        none, the playback thread logs "No audio to play" and stops by itself.
+
         Returns:
-            bool: True if audio playback started successfully, False otherwise.
+            bool: True if the decoder and playback thread were started, False if
+            miniaudio or ffmpeg is unavailable.
         """
         if not self.audio_available:
             return False
-        
-        # Extract audio from video
-        self.audio_file = self._extract_audio()
-        if not self.audio_file:
-            self.logger.log("No audio to play")
+
+        # Spawning ffmpeg is cheap; doing it here reports a missing ffmpeg
+        if not self._launch_decoder(low_latency=True):
             return False
-        
+
         # Start playback thread
         self.thread = Thread(target=self._playback_loop, daemon=True)
         self.thread.start()
         return True
-    
+
     def stop(self):
         """
         Stop audio playback and cleanup resources.
         """
         self.stop_event.set()
-        
+
         if self.thread and self.thread.is_alive():
             self.thread.join(timeout=1.0)
-        
+
         self._cleanup()
-    
+
     def _cleanup(self):
         """
-        Cleanup audio resources and temporary files.
+        Cleanup audio resources and the ffmpeg process.
         """
         try:
             if self.device:
                 self.device.close()
                 self.device = None
-            
+
             if self.stream:
                 self.stream = None
-            
-            if self.audio_file and os.path.exists(self.audio_file):
-                try:
-                    os.unlink(self.audio_file)
-                    self.logger.log(f"Cleaned up temporary audio file: {self.audio_file}")
-                except Exception as e:
-                    self.logger.log(f"Could not delete temporary audio file: {e}")
-                self.audio_file = None
+
+            self._stop_ffmpeg()
         except Exception as e:
             self.logger.log(f"Error during cleanup: {e}")